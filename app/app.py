@@ -1,12 +1,8 @@
 # Import necessary libraries
-import plotly.express as px  # For interactive data visualization (Plotly)
-from faicons import icon_svg  # For rendering icons
+import numpy as np  # For reducing the cached column arrays
 from shiny import reactive  # For reactivity in the app
 from shiny.express import input, render, ui  # UI components, input handling, and rendering
-import palmerpenguins  # Dataset with penguin data
-
-# Load the penguin dataset into a DataFrame
-df = palmerpenguins.load_penguins()
+import shared  # Data, filter kernel and static UI pieces built once per process
 
 # Set the options for the page (title, favicon, etc.)
 ui.page_opts(
@@ -24,8 +20,8 @@ with ui.sidebar(title="Penguin Filters"):
     ui.input_checkbox_group(
         "species",  # ID for this input
         "Choose Species",  # Label for the input
-        ["Adelie", "Gentoo", "Chinstrap"],  # Options for species
-        selected=["Adelie", "Gentoo", "Chinstrap"],  # Default selected species
+        list(shared.SPECIES),  # Options for species
+        selected=list(shared.SPECIES),  # Default selected species
     )
     
     # Horizontal rule for separating sections
@@ -33,45 +29,36 @@ with ui.sidebar(title="Penguin Filters"):
     
     # Display some external links for additional resources
     ui.h6("Learn More")
-    ui.a(
-        "GitHub Source Code",  # Text for the link
-        href="https://github.com/denisecase/cintel-07-tdash",  # URL to the GitHub repository
-        target="_blank",  # Open the link in a new tab
-    )
-    ui.a("Explore the App", href="https://denisecase.github.io/cintel-07-tdash/", target="_blank")
-    ui.a("GitHub Issues", href="https://github.com/denisecase/cintel-07-tdash/issues", target="_blank")
-    ui.a("About PyShiny", href="https://shiny.posit.co/py/", target="_blank")
-    ui.a("Dashboard Template", href="https://shiny.posit.co/py/templates/dashboard/", target="_blank")
-    ui.a("More Projects", href="https://github.com/denisecase/pyshiny-penguins-dashboard-express", target="_blank")
+    ui.HTML(shared.LINKS_HTML)  # All links as one static HTML snippet
 
 # Define the main layout using columns and value boxes to show key metrics
 with ui.layout_column_wrap():
     # Value box showing the number of penguins in the filtered dataset
-    with ui.value_box(showcase=icon_svg("earlybirds")):
+    with ui.value_box(showcase=shared.ICONS["earlybirds"]):
         "Penguin Count"  # Title of the value box
 
-        # Render the count of penguins (rows in the filtered DataFrame)
+        # Render the count of penguins (rows in the filtered data)
         @render.text
         def count():
-            return f"{filtered_df().shape[0]} penguins"  # Add the unit (penguins)
+            return f"{_stats()[0]} penguins"  # Add the unit (penguins)
 
     # Value box showing the average bill length of the selected species
-    with ui.value_box(showcase=icon_svg("ruler-horizontal")):
+    with ui.value_box(showcase=shared.ICONS["ruler-horizontal"]):
         "Average Bill Length"  # Title of the value box
 
         # Render the average bill length from the filtered data
         @render.text
         def bill_length():
-            return f"Avg: {filtered_df()['bill_length_mm'].mean():.1f} mm"  # Show the value and unit (mm)
+            return f"Avg: {_stats()[1]:.1f} mm"  # Show the value and unit (mm)
 
     # Value box showing the average bill depth of the selected species
-    with ui.value_box(showcase=icon_svg("ruler-vertical")):
+    with ui.value_box(showcase=shared.ICONS["ruler-vertical"]):
         "Average Bill Depth"  # Title of the value box
 
         # Render the average bill depth from the filtered data
         @render.text
         def bill_depth():
-            return f"Avg: {filtered_df()['bill_depth_mm'].mean():.1f} mm"  # Show the value and unit (mm)
+            return f"Avg: {_stats()[2]:.1f} mm"  # Show the value and unit (mm)
 
 # Define a section with multiple cards (one for the plot and one for the data grid)
 with ui.layout_columns():
@@ -82,23 +69,20 @@ with ui.layout_columns():
         # Render the scatterplot based on the filtered data using Plotly
         @render.ui
         def length_depth():
-            # Get the filtered data
-            data = filtered_df()
+            # Get the rows selected by the filters
+            mask = filter_mask()
 
             # Ensure there's data to display
-            if data.empty:
+            if not mask.any():
                 return "No data to display."
 
-            # Create the Plotly scatter plot with the light theme
-            fig = px.scatter(
-                data,  # Filtered DataFrame
-                x="bill_length_mm",  # x-axis: bill length
-                y="bill_depth_mm",  # y-axis: bill depth
-                color="species",  # Color by species
-                title="Bill Length vs Bill Depth of Penguins",  # Title of the chart
-                labels={"bill_length_mm": "Bill Length (mm)", "bill_depth_mm": "Bill Depth (mm)"},  # Axis labels
-                template="plotly"  # Light theme for the chart
-            )
+            # Update the shared figure's traces in place (species without points are hidden)
+            fig = shared.figure()
+            with fig.batch_update():
+                for trace, sp in zip(fig.data, shared.SPECIES):
+                    sp_mask = mask & shared.SPECIES_MASKS[sp]
+                    trace.x, trace.y = shared.bill_length[sp_mask], shared.bill_depth[sp_mask]
+                    trace.visible = bool(sp_mask.any())
 
             # Return the Plotly figure
             return fig
@@ -110,22 +94,29 @@ with ui.layout_columns():
         # Render the summary statistics in a data grid (showing a subset of columns)
         @render.data_frame
         def summary_statistics():
-            cols = [
-                "species",  # Species of the penguin
-                "island",  # Island where the penguin was found
-                "bill_length_mm",  # Bill length in millimeters
-                "bill_depth_mm",  # Bill depth in millimeters
-                "body_mass_g",  # Body mass in grams
-            ]
-            return render.DataGrid(filtered_df()[cols], filters=True)  # Render the DataGrid with filters
-
-# Define the reactive calculation that filters the DataFrame based on user input
+            return render.DataGrid(shared.df_grid.take(_idx()), filters=True)  # Render the DataGrid with filters
+
+# Normalize the species checkbox to a hashable set (order does not matter)
 @reactive.calc
-def filtered_df():
-    # Filter the penguins dataset by selected species
-    filt_df = df[df["species"].isin(input.species())]
-    
-    # Further filter the data based on the selected body mass
-    filt_df = filt_df.loc[filt_df["body_mass_g"] < input.mass()]
-    
-    return filt_df  # Return the filtered DataFrame
+def _species_set():
+    return frozenset(input.species())
+
+
+# Define the reactive calculation that builds the row mask based on user input
+@reactive.calc
+def filter_mask():
+    # The frozenset is used directly as the cache key
+    return shared.build_mask(input.mass(), _species_set())
+
+
+# Define the reactive calculation that turns the mask into positional row indices,
+# so each output takes only the rows (and columns) it actually needs
+@reactive.calc
+def _idx():
+    return np.flatnonzero(filter_mask())
+
+
+# Compute all value box metrics together straight from the cached column arrays
+@reactive.calc
+def _stats():
+    return shared.summarize(_idx())  # (count, avg length, avg depth)
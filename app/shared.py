@@ -0,0 +1,136 @@
+# Data and filter helpers shared by every session of the dashboard.
+# Shiny Express re-executes app.py for each new session, but this module is
+# imported normally, so the dataset, cached arrays, compiled filter kernel and
+# static UI pieces are built once per process.
+import functools  # For memoizing filter results
+import html  # For escaping the static sidebar links
+import numpy as np  # For vectorized filtering on cached column arrays
+import palmerpenguins  # Dataset with penguin data
+from faicons import icon_svg  # For rendering icons
+
+try:
+    from numba import njit  # Optional JIT for the filter kernel
+except ImportError:  # Not installed (or running in the browser via Shinylive)
+    njit = None
+
+# Render the value box icons once instead of for each session's layout
+ICONS = {name: icon_svg(name) for name in ("earlybirds", "ruler-horizontal", "ruler-vertical")}
+
+# External links for additional resources (text, URL), rendered once as static HTML
+_LINK_TUPLES = [
+    ("GitHub Source Code", "https://github.com/denisecase/cintel-07-tdash"),
+    ("Explore the App", "https://denisecase.github.io/cintel-07-tdash/"),
+    ("GitHub Issues", "https://github.com/denisecase/cintel-07-tdash/issues"),
+    ("About PyShiny", "https://shiny.posit.co/py/"),
+    ("Dashboard Template", "https://shiny.posit.co/py/templates/dashboard/"),
+    ("More Projects", "https://github.com/denisecase/pyshiny-penguins-dashboard-express"),
+]
+LINKS_HTML = "".join(
+    f'<a href="{html.escape(h)}" target="_blank">{html.escape(t)}</a><br>'  # Open each link in a new tab
+    for t, h in _LINK_TUPLES
+)
+
+# The species shown in the filters and the plot, in their order in the dataset
+SPECIES = ("Adelie", "Gentoo", "Chinstrap")
+
+# Load the penguin dataset into a DataFrame
+df = palmerpenguins.load_penguins()
+
+# Store species as a categorical so filtering compares small int8 codes
+df["species"] = df["species"].astype("category")
+
+# Cache the filter columns as NumPy arrays, so each reactive update
+# compares plain arrays instead of going through pandas indexing
+species_codes = df["species"].cat.codes.to_numpy()  # int8 code per row
+_cat = df["species"].cat.categories  # Species name for each code
+# Body mass as uint16 for narrow integer compares; missing masses get the
+# largest uint16 value, so they never fall under the slider's maximum
+_MASS_MISSING = np.iinfo(np.uint16).max
+mass = df["body_mass_g"].fillna(_MASS_MISSING).to_numpy(dtype=np.uint16)
+bill_length = df["bill_length_mm"].to_numpy()  # Bill lengths for the value box means
+bill_depth = df["bill_depth_mm"].to_numpy()  # Bill depths for the value box means
+
+# Project the columns shown in the data grid once, then only slice rows per update
+GRID_COLS = [
+    "species",  # Species of the penguin
+    "island",  # Island where the penguin was found
+    "bill_length_mm",  # Bill length in millimeters
+    "bill_depth_mm",  # Bill depth in millimeters
+    "body_mass_g",  # Body mass in grams
+]
+df_grid = df[GRID_COLS]
+
+# Precompute a row mask per species; the vocabulary is fixed, so filtering
+# only has to OR together the masks of the selected species
+SPECIES_MASKS = {sp: species_codes == _cat.get_loc(sp) for sp in SPECIES}
+
+if njit is not None:
+    # Generate a mask function specialized to the fixed species vocabulary: one
+    # compare per species code, ORed together, then ANDed with the mass threshold
+    _flags = [f"w{code}" for code in range(len(_cat))]  # One "want" flag per species code
+    _terms = " | ".join(f"({flag} & (codes == {code}))" for code, flag in enumerate(_flags))
+    _source = (
+        f"def _mask_kernel(codes, mass, max_mass, {', '.join(_flags)}):\n"
+        f"    return ({_terms}) & (mass < max_mass)\n"
+    )
+    _namespace = {}
+    exec(_source, _namespace)
+
+    # Numba cannot cache exec-generated functions on disk, so this compiles once
+    # per process (at import, so the first click does not pay the JIT cost)
+    _mask_kernel = njit(_namespace["_mask_kernel"])
+    _mask_kernel(species_codes, mass, np.uint16(0), *([True] * len(_cat)))
+else:
+    _mask_kernel = None  # Fall back to the precomputed NumPy masks
+
+
+# Build the row mask for one (mass, species) state; repeated states are served
+# from the cache, which is shared by all sessions in the process
+@functools.lru_cache(maxsize=32)
+def build_mask(max_mass, species):
+    max_mass = np.uint16(max_mass)  # Compare in the same narrow dtype as the column
+    if _mask_kernel is not None:
+        # Pass one flag per species code, in category order
+        mask = _mask_kernel(species_codes, mass, max_mass, *(sp in species for sp in _cat))
+    else:
+        # OR the selected species masks, then AND the mass threshold in place.
+        # Values outside the vocabulary are ignored, as they are on the Numba path.
+        mask = np.zeros(len(species_codes), np.bool_)
+        for sp in species & SPECIES_MASKS.keys():
+            np.logical_or(mask, SPECIES_MASKS[sp], out=mask)
+        np.logical_and(mask, mass < max_mass, out=mask)
+
+    mask.flags.writeable = False  # Cached masks are shared, so keep them read-only
+    return mask
+
+
+# Compute the value box metrics for the selected row positions
+def summarize(idx):
+    if idx.size == 0:
+        return 0, float("nan"), float("nan")  # Nothing selected, so no averages
+
+    # nanmean skips missing measurements, matching pandas' mean()
+    mean_length = np.nanmean(bill_length.take(idx))
+    mean_depth = np.nanmean(bill_depth.take(idx))
+    return idx.size, mean_length, mean_depth  # (count, avg length, avg depth)
+
+
+# Build the scatterplot figure on first use, with one (initially empty) trace per species.
+# Plotly is imported here so worker start-up does not pay for it. The figure is
+# shared by every session in the process: each render swaps in its own points and
+# Shiny serializes the figure before the synchronous render function yields to the
+# event loop, so no other session can update it in between.
+@functools.lru_cache(maxsize=None)
+def figure():
+    import plotly.graph_objects as go  # For interactive data visualization (Plotly)
+
+    return go.Figure(
+        data=[go.Scatter(x=[], y=[], mode="markers", name=sp) for sp in SPECIES],
+        layout=dict(
+            title="Bill Length vs Bill Depth of Penguins",  # Title of the chart
+            xaxis_title="Bill Length (mm)",  # x-axis: bill length
+            yaxis_title="Bill Depth (mm)",  # y-axis: bill depth
+            legend_title_text="species",  # Legend groups points by species
+            template="plotly",  # Light theme for the chart
+        ),
+    )
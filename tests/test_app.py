@@ -0,0 +1,76 @@
+# Tests for the shared filter helpers and a smoke test of the Express app
+import itertools
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+sys.path.insert(0, str(APP_DIR))  # app.py imports shared as a sibling module
+
+import shared  # noqa: E402
+
+# Every subset of the species vocabulary, from none to all three
+SELECTIONS = [
+    frozenset(sel)
+    for n in range(len(shared.SPECIES) + 1)
+    for sel in itertools.combinations(shared.SPECIES, n)
+]
+MASSES = [2000, 3500, 4201, 6000]
+
+
+@pytest.fixture(params=["numba", "numpy"])
+def engine(request, monkeypatch):
+    if request.param == "numba":
+        if shared._mask_kernel is None:
+            pytest.skip("numba is not installed")
+    else:
+        monkeypatch.setattr(shared, "_mask_kernel", None)  # Force the NumPy fallback
+    shared.build_mask.cache_clear()  # Do not reuse masks built by the other engine
+    yield request.param
+    shared.build_mask.cache_clear()
+
+
+def expected_mask(max_mass, species):
+    df = shared.df
+    return (df["species"].isin(species) & (df["body_mass_g"] < max_mass)).to_numpy()
+
+
+@pytest.mark.parametrize("max_mass", MASSES)
+@pytest.mark.parametrize("species", SELECTIONS, ids=lambda sel: "+".join(sorted(sel)) or "none")
+def test_build_mask_matches_pandas(engine, max_mass, species):
+    mask = shared.build_mask(max_mass, species)
+    np.testing.assert_array_equal(mask, expected_mask(max_mass, species))
+
+
+def test_build_mask_ignores_unknown_species(engine):
+    mask = shared.build_mask(6000, frozenset({"Adelie", "Emperor"}))
+    np.testing.assert_array_equal(mask, expected_mask(6000, {"Adelie"}))
+
+
+@pytest.mark.parametrize("max_mass", MASSES)
+@pytest.mark.parametrize("species", SELECTIONS, ids=lambda sel: "+".join(sorted(sel)) or "none")
+def test_summarize_matches_pandas(max_mass, species):
+    selected = shared.df[expected_mask(max_mass, species)]
+    count, mean_length, mean_depth = shared.summarize(np.flatnonzero(shared.build_mask(max_mass, species)))
+
+    assert count == len(selected)
+    for value, column in [(mean_length, "bill_length_mm"), (mean_depth, "bill_depth_mm")]:
+        expected = selected[column].mean()
+        if math.isnan(expected):
+            assert math.isnan(value)
+        else:
+            assert value == pytest.approx(expected, rel=1e-12)  # Same float64 precision as pandas
+
+
+def test_app_page_builds_with_numba():
+    pytest.importorskip("numba")  # The JIT path runs extra code when the app is built
+    express = pytest.importorskip("shiny.express")
+    testclient = pytest.importorskip("starlette.testclient")
+
+    app = express.wrap_express_app(APP_DIR / "app.py")
+    with testclient.TestClient(app) as client:
+        response = client.get("/")
+    assert response.status_code == 200